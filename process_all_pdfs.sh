@@ -11,10 +11,8 @@ if [ ! -d "/app/input" ]; then
     exit 1
 fi
 
-# Check if output directory exists, create if not
-if [ ! -d "/app/output" ]; then
-    mkdir -p /app/output
-fi
+# Create output directory if needed (no-op when it already exists)
+mkdir -p /app/output
 
 # Count PDF files
 pdf_count=$(find /app/input -name "*.pdf" -type f | wc -l)
@@ -25,17 +23,9 @@ if [ $pdf_count -eq 0 ]; then
     exit 1
 fi
 
-# Count PDF files
-pdf_count=$(find /app/input -name "*.pdf" -type f | wc -l)
-echo "Found $pdf_count PDF files to process"
-
-if [ $pdf_count -eq 0 ]; then
-    echo "No PDF files found in /app/input directory"
-    exit 1
-fi
-
-# Process each PDF file
-find /app/input -name "*.pdf" -type f | sort | while read pdf_file; do
+# Process a single PDF file
+process_pdf() {
+    pdf_file="$1"
     echo "Processing file: $(basename "$pdf_file")"
     
     # Extract base filename without extension
@@ -50,7 +40,12 @@ find /app/input -name "*.pdf" -type f | sort | while read pdf_file; do
     else
         echo "❌ Failed to process: $(basename "$pdf_file")"
     fi
-done
+}
+export -f process_pdf
+
+# Process PDF files in parallel, one adobe1a process per CPU core
+find /app/input -name "*.pdf" -type f -print0 | sort -z | \
+    xargs -0 -n 1 -P "$(nproc)" bash -c 'process_pdf "$1"' _
 
 echo "PDF processing completed!"
 echo "Output files are available in /app/output/"
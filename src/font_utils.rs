@@ -6,7 +6,6 @@ pub struct TextRun {
     pub text: String,
     pub size: f64,
     pub page: usize,
-    pub font_name: String,
     pub is_bold: bool,
     pub is_italic: bool,
 }
@@ -19,27 +18,43 @@ pub struct HeadingCandidate {
     pub confidence: f64,
 }
 
-// Extract text runs with their font size and style from a PDF
-pub fn extract_runs(doc: &Document) -> Vec<TextRun> {
-    let mut runs = Vec::new();
+// Visit text runs with their font size and style from a PDF, in content order.
+// Positioning operators (Td, TD, Tm, T*) are deliberately ignored: headings are
+// classified by font size and style alone, so no layout or reading-order pass is needed.
+pub fn visit_runs<F: FnMut(TextRun)>(doc: &Document, mut visit: F) {
+    // Documents switch between a handful of fonts many times, so memoize the style per name
+    let mut style_cache: HashMap<Vec<u8>, (bool, bool)> = HashMap::new();
 
     for (page_idx, (&_page_no, &page_id)) in doc.get_pages().iter().enumerate() {
         let current_page = page_idx + 1;
 
         // Get the page content stream and decode operations
         if let Ok(content_data) = doc.get_page_content(page_id) {
+            // Blank and image-only pages have no text-showing operators; skip decoding them
+            if !has_text_operators(&content_data) {
+                continue;
+            }
+
             if let Ok(content) = Content::decode(&content_data) {
                 let mut cur_font_size = 12.0_f64;
-                let mut cur_font_name = String::new();
+                // Style only changes with the font, so classify on "Tf" rather than per run
+                let (mut cur_is_bold, mut cur_is_italic) = (false, false);
 
                 for op in content.operations {
                     match op.operator.as_ref() {
                         "Tf" => {
                             // "Tf" has operands: font-name, font-size
                             if op.operands.len() == 2 {
-                                // Extract font name
+                                // Extract font style from the font name
                                 if let Object::Name(name) = &op.operands[0] {
-                                    cur_font_name = String::from_utf8_lossy(name).to_string();
+                                    (cur_is_bold, cur_is_italic) = match style_cache.get(name.as_slice()) {
+                                        Some(&style) => style,
+                                        None => {
+                                            let style = analyze_font_style(&String::from_utf8_lossy(name));
+                                            style_cache.insert(name.clone(), style);
+                                            style
+                                        }
+                                    };
                                 }
                                 
                                 // Extract font size
@@ -58,14 +73,12 @@ pub fn extract_runs(doc: &Document) -> Vec<TextRun> {
                             if let Some(text_obj) = op.operands.get(0) {
                                 if let Some(text) = try_decode_text(text_obj, doc) {
                                     if !text.trim().is_empty() {
-                                        let (is_bold, is_italic) = analyze_font_style(&cur_font_name);
-                                        runs.push(TextRun { 
+                                        visit(TextRun { 
                                             text, 
                                             size: cur_font_size, 
                                             page: current_page,
-                                            font_name: cur_font_name.clone(),
-                                            is_bold,
-                                            is_italic,
+                                            is_bold: cur_is_bold,
+                                            is_italic: cur_is_italic,
                                         });
                                     }
                                 }
@@ -75,21 +88,21 @@ pub fn extract_runs(doc: &Document) -> Vec<TextRun> {
                             // Array of strings and numbers
                             if let Some(text_obj) = op.operands.get(0) {
                                 if let Object::Array(items) = text_obj {
-                                    let mut combined = String::new();
+                                    // Gather the raw string bytes and decode once for the whole array
+                                    let mut raw = Vec::new();
                                     for item in items {
-                                        if let Some(s) = try_decode_text(item, doc) {
-                                            combined.push_str(&s);
+                                        if let Some(bytes) = string_bytes(item) {
+                                            raw.extend_from_slice(bytes);
                                         }
                                     }
+                                    let combined = String::from_utf8_lossy(&raw).into_owned();
                                     if !combined.trim().is_empty() {
-                                        let (is_bold, is_italic) = analyze_font_style(&cur_font_name);
-                                        runs.push(TextRun { 
+                                        visit(TextRun { 
                                             text: combined, 
                                             size: cur_font_size, 
                                             page: current_page,
-                                            font_name: cur_font_name.clone(),
-                                            is_bold,
-                                            is_italic,
+                                            is_bold: cur_is_bold,
+                                            is_italic: cur_is_italic,
                                         });
                                     }
                                 }
@@ -101,15 +114,20 @@ pub fn extract_runs(doc: &Document) -> Vec<TextRun> {
             }
         }
     }
+}
 
-    runs
+// Cheap byte scan for "Tj"/"TJ" so pages without text skip full content decoding
+fn has_text_operators(content_data: &[u8]) -> bool {
+    content_data.windows(2).any(|w| w == b"Tj" || w == b"TJ")
 }
 
 fn try_decode_text(obj: &Object, _doc: &Document) -> Option<String> {
+    string_bytes(obj).map(|bytes| String::from_utf8_lossy(bytes).into_owned())
+}
+
+fn string_bytes(obj: &Object) -> Option<&[u8]> {
     match obj {
-        Object::String(bytes, _) => {
-            Some(String::from_utf8_lossy(&bytes).to_string())
-        }
+        Object::String(bytes, _) => Some(bytes),
         _ => None,
     }
 }
@@ -162,39 +180,26 @@ pub fn classify_heading(size: f64, is_bold: bool, is_italic: bool) -> (String, f
 
 // Extract heading candidates with confidence scores
 pub fn extract_heading_candidates(doc: &Document) -> Vec<HeadingCandidate> {
-    let runs = extract_runs(doc);
     let mut candidates = Vec::new();
     
-    // Group runs by page and line (approximate)
-    let mut page_lines: HashMap<usize, Vec<String>> = HashMap::new();
-    let mut page_run_info: HashMap<(usize, String), (f64, bool, bool)> = HashMap::new();
-    
-    for run in runs {
+    // Classify each run as it is decoded rather than buffering and regrouping by page
+    visit_runs(doc, |run| {
         let text = run.text.trim();
         if text.len() <= 3 || text.len() > 150 { // Better length filtering like Python
-            continue;
+            return;
         }
         
-        page_lines.entry(run.page).or_insert_with(Vec::new).push(text.to_string());
-        page_run_info.insert((run.page, text.to_string()), (run.size, run.is_bold, run.is_italic));
-    }
-    
-    for (page_num, lines) in page_lines {
-        for line in lines {
-            if let Some((size, is_bold, is_italic)) = page_run_info.get(&(page_num, line.clone())) {
-                let (level, confidence) = classify_heading(*size, *is_bold, *is_italic);
-                
-                if confidence > 0.5 && is_good_heading_candidate(&line) {
-                    candidates.push(HeadingCandidate {
-                        text: line,
-                        level,
-                        page: page_num,
-                        confidence,
-                    });
-                }
-            }
+        let (level, confidence) = classify_heading(run.size, run.is_bold, run.is_italic);
+        
+        if confidence > 0.5 && is_good_heading_candidate(text) {
+            candidates.push(HeadingCandidate {
+                text: text.to_string(),
+                level,
+                page: run.page,
+                confidence,
+            });
         }
-    }
+    });
     
     candidates
 }
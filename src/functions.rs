@@ -2,6 +2,15 @@ use regex::Regex;
 use once_cell::sync::Lazy;
 use crate::{Heading, TITLE_PATTERN, NUMBERED_HEADING, APPENDIX_HEADING, SECTION_HEADING, COLON_HEADING};
 
+static NUMBERED_PREFIX: Lazy<Regex> = Lazy::new(||
+    Regex::new(r"^(?P<prefix>(?:\d+\.)+\d+|\d+|[A-Za-z]{1,2}|[IVXLCDM]+)[\.)]?").unwrap());
+static ROMAN_NUMERAL: Lazy<Regex> = Lazy::new(||
+    Regex::new(r"^[IVXLCDM]+$").unwrap());
+static TRAILING_PAGE_NUMBER: Lazy<Regex> = Lazy::new(||
+    Regex::new(r"\s+\d{1,3}$").unwrap());
+static DOTTED_LEADERS: Lazy<Regex> = Lazy::new(||
+    Regex::new(r"\s*\.{3,}\s*\d*$").unwrap());
+
 pub fn extract_document_title(lines: &[&str], _first_page_text: &str) -> String {
     let mut candidate_titles = Vec::new();
     
@@ -12,12 +21,14 @@ pub fn extract_document_title(lines: &[&str], _first_page_text: &str) -> String
             continue;
         }
         
+        let line_lower = line.to_lowercase();
+        
         if line.starts_with("Page ") || 
            line.contains("http") ||
            line.contains("www.") ||
            line.contains("@") ||
            line.contains("©") ||
-           line.to_lowercase().contains("table of contents") {
+           line_lower.contains("table of contents") {
             continue;
         }
         
@@ -29,20 +40,21 @@ pub fn extract_document_title(lines: &[&str], _first_page_text: &str) -> String
             score += 15;
         }
         
-        let words: Vec<&str> = line.split_whitespace().collect();
-        let capitalized_words = words.iter()
-            .filter(|word| word.chars().next().map_or(false, |c| c.is_uppercase()))
-            .count();
+        // Running counts; the words themselves are not needed
+        let (word_count, capitalized_words) = line.split_whitespace()
+            .fold((0usize, 0usize), |(total, capitalized), word| {
+                let is_capitalized = word.chars().next().map_or(false, |c| c.is_uppercase());
+                (total + 1, capitalized + is_capitalized as usize)
+            });
         
-        if capitalized_words > words.len() / 2 && words.len() >= 2 {
+        if capitalized_words > word_count / 2 && word_count >= 2 {
             score += 20;
         }
         
-        if line == line.to_uppercase() && line.len() <= 80 {
+        if line.len() <= 80 && line == line.to_uppercase() {
             score += 10;
         }
         
-        let line_lower = line.to_lowercase();
         let title_indicators = [
             "foundation", "guide", "manual", "handbook", "report", "study",
             "analysis", "overview", "introduction", "specification", "standard",
@@ -68,7 +80,7 @@ pub fn extract_document_title(lines: &[&str], _first_page_text: &str) -> String
             score -= 20;
         }
         
-        if line.ends_with('.') && words.len() > 8 {
+        if line.ends_with('.') && word_count > 8 {
             score -= 10;
         }
         
@@ -253,61 +265,70 @@ fn determine_heading_level_by_content(line: &str) -> String {
     "H2".to_string()
 }
 
+// Expects headings already in page order (both extractors emit them that way),
+// so the de-duplicated result keeps that order without a re-sort
 pub fn establish_hierarchy(headings: Vec<Heading>) -> Vec<Heading> {
     let mut unique_headings = Vec::new();
-    let mut seen_texts: std::collections::HashSet<String> = std::collections::HashSet::new();
+    // Keyed by the heading text with numbering stripped, so each heading is one hash lookup
+    let mut seen_keys: std::collections::HashSet<String> = std::collections::HashSet::new();
     
-    for heading in &headings {
-        let normalized_text = heading.text.to_lowercase().trim().to_string();
-        
+    for heading in headings {
         let text_without_numbers = heading.text.chars()
             .filter(|c| !c.is_ascii_digit() && *c != '.' && *c != ':')
             .collect::<String>()
             .trim()
             .to_lowercase();
             
-        let is_duplicate = seen_texts.iter().any(|seen| {
-            let seen_without_numbers = seen.chars()
-                .filter(|c| !c.is_ascii_digit() && *c != '.' && *c != ':')
-                .collect::<String>()
-                .trim()
-                .to_lowercase();
-            seen_without_numbers == text_without_numbers && 
-            !text_without_numbers.is_empty() &&
-            text_without_numbers.len() > 5  
-        });
+        let is_duplicate = text_without_numbers.len() > 5 &&
+                           seen_keys.contains(&text_without_numbers);
         
         if !is_duplicate {
-            seen_texts.insert(normalized_text);
-            unique_headings.push(heading.clone());
+            seen_keys.insert(text_without_numbers);
+            unique_headings.push(heading);
         }
     }
     
-    unique_headings.sort_by(|a, b| a.page.cmp(&b.page));
     unique_headings
 }
 
 pub fn is_excluded_text(line: &str) -> bool {
-    let line_lower = line.to_lowercase();
+    // Cheap character checks first so most rejections skip the lowercase copy and substring scans
+    if line.trim().len() < 3 {
+        return true;
+    }
     
-    let generic_exclusions = [
-        "www.", "http", "@", "©", "copyright", "page ",
-        "table of contents", "index", "references", "bibliography",
-        "acknowledgments", "acknowledgements", "preface", "foreword"
-    ];
+    if line.chars().next().map_or(false, |c| c.is_lowercase()) &&
+       !line.starts_with('(') && !line.starts_with('[') {
+        return true;
+    }
     
-    if generic_exclusions.iter().any(|&exclusion| line_lower.contains(exclusion)) {
+    if line.ends_with(',') || line.ends_with("and") || line.ends_with("or") || 
+       line.ends_with("the") || line.ends_with("of") || line.ends_with("in") ||
+       line.ends_with("to") || line.ends_with("for") || line.ends_with("with") {
         return true;
     }
     
-    let non_letter_count = line.chars().filter(|c| !c.is_alphabetic()).count();
-    let total_chars = line.chars().count();
+    let (non_letter_count, total_chars) = line.chars()
+        .fold((0usize, 0usize), |(non_letters, total), c| (non_letters + (!c.is_alphabetic()) as usize, total + 1));
     
     if total_chars > 0 && non_letter_count as f64 / total_chars as f64 > 0.7 {
         return true;
     }
     
-    if line.trim().len() < 3 {
+    if (line.contains("$") || line.contains("€") || line.contains("£")) &&
+       line.matches(char::is_numeric).count() > 2 {
+        return true;
+    }
+    
+    let line_lower = line.to_lowercase();
+    
+    let generic_exclusions = [
+        "www.", "http", "@", "©", "copyright", "page ",
+        "table of contents", "index", "references", "bibliography",
+        "acknowledgments", "acknowledgements", "preface", "foreword"
+    ];
+    
+    if generic_exclusions.iter().any(|&exclusion| line_lower.contains(exclusion)) {
         return true;
     }
     
@@ -319,11 +340,6 @@ pub fn is_excluded_text(line: &str) -> bool {
         return true;
     }
     
-    if (line.contains("$") || line.contains("€") || line.contains("£")) &&
-       line.matches(char::is_numeric).count() > 2 {
-        return true;
-    }
-    
     let prose_patterns = [
         "the following", "as mentioned", "according to", "it should be noted",
         "please refer", "see section", "as shown in", "this chapter",
@@ -334,24 +350,12 @@ pub fn is_excluded_text(line: &str) -> bool {
         return true;
     }
     
-    if line.ends_with(',') || line.ends_with("and") || line.ends_with("or") || 
-       line.ends_with("the") || line.ends_with("of") || line.ends_with("in") ||
-       line.ends_with("to") || line.ends_with("for") || line.ends_with("with") {
-        return true;
-    }
-    
-    if line.chars().next().map_or(false, |c| c.is_lowercase()) &&
-       !line.starts_with('(') && !line.starts_with('[') {
-        return true;
-    }
-    
     false
 }
 
 pub fn determine_numbered_level(line: &str) -> String {
     let raw_prefix = line.trim_start();
-    let re = Regex::new(r"^(?P<prefix>(?:\d+\.)+\d+|\d+|[A-Za-z]{1,2}|[IVXLCDM]+)[\.)]?").unwrap();
-    let captures = re.captures(raw_prefix);
+    let captures = NUMBERED_PREFIX.captures(raw_prefix);
 
     let prefix = captures.and_then(|c| c.name("prefix")).map(|m| m.as_str()).unwrap_or("");
 
@@ -372,8 +376,7 @@ pub fn determine_numbered_level(line: &str) -> String {
     }
 
     // Roman numerals -> assume H2 as well
-    let roman_re = Regex::new(r"^[IVXLCDM]+$").unwrap();
-    if roman_re.is_match(prefix) {
+    if ROMAN_NUMERAL.is_match(prefix) {
         return "H2".to_string();
     }
 
@@ -391,11 +394,8 @@ pub fn clean_heading_text(text: &str) -> String {
         text.to_string()
     };
 
-    let page_number_regex = Regex::new(r"\s+\d{1,3}$").unwrap();
-    cleaned = page_number_regex.replace(&cleaned, "").to_string();
-    
-    let dotted_leaders_regex = Regex::new(r"\s*\.{3,}\s*\d*$").unwrap();
-    cleaned = dotted_leaders_regex.replace(&cleaned, "").to_string();
+    cleaned = TRAILING_PAGE_NUMBER.replace(&cleaned, "").to_string();
+    cleaned = DOTTED_LEADERS.replace(&cleaned, "").to_string();
     
     cleaned.split_whitespace().collect::<Vec<_>>().join(" ")
 }
@@ -1,6 +1,9 @@
 use lopdf::Document;
 use pdf_extract;
 use serde::{Serialize, Deserialize};
+use std::collections::HashSet;
+use std::fs::File;
+use std::io::{BufWriter, Write};
 use std::path::PathBuf;
 use clap::Parser;
 use anyhow::{Context, Result};
@@ -51,24 +54,29 @@ fn main() -> Result<()> {
     let outline = extract_outline(&args.input)
         .with_context(|| format!("Failed to process {}", args.input.display()))?;
     
-    std::fs::write(&args.output, serde_json::to_string_pretty(&outline)?)?;
+    // Serialize straight into a buffered file instead of building the JSON string first
+    let mut writer = BufWriter::new(File::create(&args.output)?);
+    serde_json::to_writer_pretty(&mut writer, &outline)?;
+    writer.flush()?;
     println!("Successfully processed {}", args.input.display());
     Ok(())
 }
 
 fn extract_outline(pdf_path: &PathBuf) -> Result<Outline> {
-    if let Ok(outline) = try_pdf_extract(pdf_path) {
+    // Read the file once and hand the same buffer to both extractors
+    let bytes = std::fs::read(pdf_path)?;
+
+    if let Ok(outline) = try_pdf_extract(pdf_path, &bytes) {
         if !outline.outline.is_empty() {
             return Ok(outline);
         }
     }
 
-    extract_with_lopdf(pdf_path)
+    extract_with_lopdf(pdf_path, &bytes)
 }
 
-fn try_pdf_extract(pdf_path: &PathBuf) -> Result<Outline> {
-    let bytes = std::fs::read(pdf_path)?;
-    let text = pdf_extract::extract_text_from_mem(&bytes)?;
+fn try_pdf_extract(pdf_path: &PathBuf, bytes: &[u8]) -> Result<Outline> {
+    let text = pdf_extract::extract_text_from_mem(bytes)?;
     
     if text.trim().is_empty() {
         return Err(anyhow::anyhow!("No text extracted"));
@@ -76,6 +84,7 @@ fn try_pdf_extract(pdf_path: &PathBuf) -> Result<Outline> {
 
     let mut title = String::new();
     let mut headings = Vec::new();
+    let mut seen: HashSet<(String, usize)> = HashSet::new();
 
     let pages: Vec<&str> = if text.contains('\x0C') {
         text.split('\x0C').collect()
@@ -101,7 +110,7 @@ fn try_pdf_extract(pdf_path: &PathBuf) -> Result<Outline> {
                 &lines,
                 current_page,
             ) {
-                if !headings.iter().any(|h: &Heading| h.text == heading.text && h.page == heading.page) {
+                if seen.insert((heading.text.clone(), heading.page)) {
                     headings.push(heading);
                 }
             }
@@ -121,15 +130,15 @@ fn try_pdf_extract(pdf_path: &PathBuf) -> Result<Outline> {
     })
 }
 
-fn extract_with_lopdf(pdf_path: &PathBuf) -> Result<Outline> {
-    let doc = Document::load(pdf_path)?;
+fn extract_with_lopdf(pdf_path: &PathBuf, bytes: &[u8]) -> Result<Outline> {
+    let doc = Document::load_mem(bytes)?;
     let mut title = String::new();
     
     // Use the new font-based approach
     let heading_candidates = font_utils::extract_heading_candidates(&doc);
     
     // Convert font-based candidates to our Heading format and filter
-    let mut headings: Vec<Heading> = heading_candidates.into_iter()
+    let headings: Vec<Heading> = heading_candidates.into_iter()
         .filter(|candidate| {
             candidate.text.len() > 3 && 
             candidate.confidence > 0.6 && // Higher confidence threshold
@@ -143,27 +152,35 @@ fn extract_with_lopdf(pdf_path: &PathBuf) -> Result<Outline> {
         })
         .collect();
 
-    // Sort by confidence and take top candidates to avoid noise
-    headings.sort_by(|a, b| b.confidence.partial_cmp(&a.confidence).unwrap_or(std::cmp::Ordering::Equal));
+    // Rank by confidence, breaking ties by original position so the result
+    // matches a stable sort without sorting every candidate
+    let by_rank = |a: &(usize, Heading), b: &(usize, Heading)| {
+        b.1.confidence.partial_cmp(&a.1.confidence)
+            .unwrap_or(std::cmp::Ordering::Equal)
+            .then(a.0.cmp(&b.0))
+    };
+    let mut ranked: Vec<(usize, Heading)> = headings.into_iter().enumerate().collect();
     
     // Take only top 50 headings to avoid overwhelming output
-    headings.truncate(50);
+    if ranked.len() > 50 {
+        ranked.select_nth_unstable_by(50, by_rank);
+        ranked.truncate(50);
+    }
     
     // Sort back by page order
-    headings.sort_by(|a, b| a.page.cmp(&b.page));
+    ranked.sort_by(|a, b| a.1.page.cmp(&b.1.page).then_with(|| by_rank(a, b)));
+    let headings: Vec<Heading> = ranked.into_iter().map(|(_, heading)| heading).collect();
 
     // Extract title from first page if we haven't found one
     if title.is_empty() {
-        for (page_index, (page_id, _)) in doc.page_iter().enumerate() {
-            if page_index == 0 { // First page only
-                if let Ok(text) = doc.extract_text(&[page_id]) {
-                    let lines: Vec<&str> = text.lines()
-                        .map(|l| l.trim())
-                        .filter(|l| !l.is_empty())
-                        .collect();
-                    title = functions::extract_document_title(&lines, &text);
-                    break;
-                }
+        // First page only; stop the page walk as soon as it is reached
+        if let Some((page_id, _)) = doc.page_iter().next() {
+            if let Ok(text) = doc.extract_text(&[page_id]) {
+                let lines: Vec<&str> = text.lines()
+                    .map(|l| l.trim())
+                    .filter(|l| !l.is_empty())
+                    .collect();
+                title = functions::extract_document_title(&lines, &text);
             }
         }
     }